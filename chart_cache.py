@@ -0,0 +1,111 @@
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from config import CHART_CACHE_DIR, CHART_CACHE_SIZE, COLORS
+from storage import write_atomic
+
+INDEX_FILE = 'index.json'
+
+def chart_key(chart_type, data):
+    """Hash the chart type and its inputs into a cache key"""
+    # Colors are part of the key so restyled charts are not served stale
+    payload = json.dumps({'chart': chart_type, 'data': data, 'colors': COLORS},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ChartCache:
+    """LRU cache of rendered PNG charts, persisted to disk between runs"""
+
+    def __init__(self, cache_dir=CHART_CACHE_DIR, max_entries=CHART_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        # Oldest entry first; values are PNG bytes, or None while still on disk only
+        self.entries = OrderedDict()
+        # Set when a cache hit changed the LRU order since the index was saved
+        self.order_changed = False
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def _load_index(self):
+        """Restore the LRU order of images cached by a previous run"""
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE), 'r') as f:
+                keys = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            keys = []
+
+        for key in keys:
+            if os.path.exists(self._path(key)):
+                self.entries[key] = None
+        self._evict()
+
+    def _save_index(self):
+        write_atomic(os.path.join(self.cache_dir, INDEX_FILE),
+                     json.dumps(list(self.entries.keys())))
+        self.order_changed = False
+
+    def _evict(self):
+        """Drop least recently used images until the cache fits"""
+        while len(self.entries) > self.max_entries:
+            key, _ = self.entries.popitem(last=False)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def get(self, key):
+        """Return cached PNG bytes for key, or None on a miss"""
+        if key not in self.entries:
+            return None
+
+        image = self.entries[key]
+        if image is None:
+            try:
+                with open(self._path(key), 'rb') as f:
+                    image = f.read()
+            except FileNotFoundError:
+                del self.entries[key]
+                return None
+            self.entries[key] = image
+
+        # The new order is saved with the next put or on close
+        self.entries.move_to_end(key)
+        self.order_changed = True
+        return image
+
+    def put(self, key, image):
+        """Store PNG bytes under key"""
+        # Written atomically so a crash never leaves a torn image
+        write_atomic(self._path(key), image)
+        self.entries[key] = image
+        self.entries.move_to_end(key)
+        self._evict()
+        self._save_index()
+
+    def get_or_render(self, chart_type, data, render):
+        """Return the cached image for these inputs, rendering it on a miss"""
+        key = chart_key(chart_type, data)
+        image = self.get(key)
+        if image is None:
+            image = render(chart_type, data)
+            self.put(key, image)
+        return image
+
+    def close(self):
+        """Save the LRU order if cache hits changed it"""
+        if self.order_changed:
+            self._save_index()
+
+    def clear(self):
+        """Remove every cached image"""
+        for key in list(self.entries.keys()):
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+        self.entries.clear()
+        self._save_index()
@@ -0,0 +1,81 @@
+"""Chart drawing shared by the dashboard and the headless reports.
+
+Only uses matplotlib's Agg backend, so it can be imported without Tk.
+"""
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import datetime
+import io
+from config import COLORS
+
+TYPE_COLORS = {
+    'focus': COLORS['work'],
+    'short_break': COLORS['short_break'],
+    'long_break': COLORS['long_break']
+}
+
+TYPE_NAMES = {
+    'focus': 'Focus',
+    'short_break': 'Short Break',
+    'long_break': 'Long Break'
+}
+
+# Figure size in inches for each chart rendered on its own
+CHART_SIZES = {
+    'weekly': (6, 3),
+    'distribution': (4, 3)
+}
+
+def weekly_chart_data(weekly_stats):
+    """Turn weekly stats into [day, minutes] pairs for the last 7 days"""
+    days = list(weekly_stats['daily_focus'].keys())[-7:]
+    return [[day, weekly_stats['daily_focus'][day]] for day in days]
+
+def distribution_chart_data(sessions):
+    """Count sessions per type as [session_type, count] pairs"""
+    session_types = {}
+    for session in sessions:
+        session_type = session['session_type']
+        session_types[session_type] = session_types.get(session_type, 0) + 1
+    return [[session_type, count] for session_type, count in session_types.items()]
+
+def plot_weekly_chart(ax, data):
+    """Draw the weekly focus bar chart onto ax"""
+    # Use full day names for display
+    day_names = [datetime.datetime.strptime(day, "%Y-%m-%d").strftime("%a") for day, _ in data]
+    minutes = [value for _, value in data]
+    
+    bars = ax.bar(day_names, minutes, color=COLORS['work'], alpha=0.7)
+    ax.set_ylabel('Focus Minutes')
+    ax.set_title('Weekly Focus Time')
+    
+    # Add value labels on bars
+    for bar, value in zip(bars, minutes):
+        if value > 0:
+            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1, 
+                   str(int(value)), ha='center', va='bottom', fontsize=9)
+
+def plot_distribution_chart(ax, data):
+    """Draw the session type pie chart onto ax"""
+    labels = [TYPE_NAMES.get(session_type, session_type) for session_type, _ in data]
+    sizes = [count for _, count in data]
+    colors = [TYPE_COLORS.get(session_type, COLORS['secondary']) for session_type, _ in data]
+    
+    ax.pie(sizes, labels=labels, colors=colors, autopct='%1.0f%%', startangle=90)
+    ax.set_title('Session Distribution')
+
+CHART_PLOTTERS = {
+    'weekly': plot_weekly_chart,
+    'distribution': plot_distribution_chart
+}
+
+def render_chart(chart_type, data):
+    """Render a single chart to PNG bytes without any GUI backend"""
+    fig = Figure(figsize=CHART_SIZES[chart_type], dpi=80)
+    ax = fig.add_subplot(111)
+    CHART_PLOTTERS[chart_type](ax, data)
+    fig.tight_layout()
+    
+    buffer = io.BytesIO()
+    FigureCanvasAgg(fig).print_png(buffer)
+    return buffer.getvalue()
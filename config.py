@@ -1,6 +1,7 @@
 # Application configuration
 import os
 import json
+import datetime
 
 # Path configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -8,6 +9,21 @@ ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 SESSION_FILE = os.path.join(DATA_DIR, 'sessions.json')
 SETTINGS_FILE = os.path.join(DATA_DIR, 'settings.json')
+STATS_FILE = os.path.join(DATA_DIR, 'session_stats.json')
+TIMER_EVENTS_FILE = os.path.join(DATA_DIR, 'timer_events.log')
+TIMER_SNAPSHOT_FILE = os.path.join(DATA_DIR, 'timer_snapshot.json')
+PROFILES_DIR = os.path.join(DATA_DIR, 'profiles')
+CHART_CACHE_DIR = os.path.join(DATA_DIR, 'chart_cache')
+REPORTS_DIR = os.path.join(BASE_DIR, 'reports')
+
+# Maximum number of rendered chart images kept in the chart cache
+CHART_CACHE_SIZE = 32
+
+# Timer crash recovery: seconds between snapshots of a running timer, and
+# how long the app may be closed before an unfinished focus session is
+# logged as interrupted instead of being resumed
+SNAPSHOT_INTERVAL = 10
+RECOVERY_TIMEOUT = 30 * 60
 
 # Default timer settings (in minutes)
 DEFAULT_SETTINGS = {
@@ -35,10 +51,10 @@ COLORS = {
 os.makedirs(ASSETS_DIR, exist_ok=True)
 os.makedirs(DATA_DIR, exist_ok=True)
 
-def load_settings():
+def load_settings(settings_file=SETTINGS_FILE):
     """Load settings from JSON file or return defaults"""
     try:
-        with open(SETTINGS_FILE, 'r') as f:
+        with open(settings_file, 'r') as f:
             settings = json.load(f)
             # Ensure all settings are present
             for key, value in DEFAULT_SETTINGS.items():
@@ -48,7 +64,17 @@ def load_settings():
     except (FileNotFoundError, json.JSONDecodeError):
         return DEFAULT_SETTINGS.copy()
 
-def save_settings(settings):
+def save_settings(settings, settings_file=SETTINGS_FILE):
     """Save settings to JSON file"""
-    with open(SETTINGS_FILE, 'w') as f:
-        json.dump(settings, f, indent=2)
\ No newline at end of file
+    with open(settings_file, 'w') as f:
+        json.dump(settings, f, indent=2)
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD date as stored in sessions"""
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+def start_of_week(reference_date=None):
+    """Return the Monday of the week containing reference_date (default: today)"""
+    if reference_date is None:
+        reference_date = datetime.date.today()
+    return reference_date - datetime.timedelta(days=reference_date.weekday())
\ No newline at end of file
@@ -1,8 +1,7 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
 import threading
-from timer_logic import PomodoroTimer
-from session_manager import SessionManager
+from profiles import ProfileManager
 from visualization import Dashboard
 from settings_window import SettingsWindow
 from config import COLORS
@@ -25,15 +24,30 @@ class StudyTimerApp:
         self.root.configure(bg=COLORS['light'])
         
         # Initialize components
-        self.timer = PomodoroTimer()
-        self.session_manager = SessionManager()
+        self.profile_manager = ProfileManager()
+        restored = self.load_profile(self.profile_manager.get_active())
         
         # Setup GUI
         self.setup_gui()
+        if restored:
+            self.start_button.config(text="Resume")
+        
+        # Save the timer state before the window closes
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Start timer update loop
         self.update_timer()
     
+    def load_profile(self, profile):
+        """Load the timer and sessions of a profile, returns True if its timer was restored"""
+        self.profile = profile
+        self.timer = profile.create_timer()
+        self.state_log = self.timer.state_log
+        self.session_manager = profile.create_session_manager()
+        
+        # Pick up where the last run stopped
+        return self.state_log.restore(self.timer, self.session_manager)
+    
     def setup_gui(self):
         # Create notebook for tabs
         self.notebook = ttk.Notebook(self.root)
@@ -51,6 +65,20 @@ class StudyTimerApp:
         self.setup_dashboard_tab()
     
     def setup_timer_tab(self):
+        # Profile selector
+        profile_frame = ttk.Frame(self.timer_frame)
+        profile_frame.pack(pady=(10, 0))
+        
+        ttk.Label(profile_frame, text="Profile:").pack(side='left')
+        self.profile_var = tk.StringVar(value=self.profile.name)
+        self.profile_combo = ttk.Combobox(profile_frame, textvariable=self.profile_var,
+                                          state='readonly', width=20)
+        self.profile_combo.pack(side='left', padx=5)
+        self.profile_combo.bind('<<ComboboxSelected>>', self.on_profile_selected)
+        ttk.Button(profile_frame, text="New Profile", 
+                  command=self.create_profile).pack(side='left')
+        self.update_profile_list()
+        
         # Timer display
         self.time_label = tk.Label(self.timer_frame, text="25:00", font=('Arial', 48, 'bold'),
                                   fg=COLORS['primary'], bg=COLORS['light'])
@@ -102,6 +130,41 @@ class StudyTimerApp:
                                 command=self.dashboard.refresh)
         refresh_btn.pack(pady=10)
     
+    def update_profile_list(self):
+        self.profiles = self.profile_manager.list_profiles()
+        self.profile_combo.config(values=[profile.name for profile in self.profiles])
+        self.profile_var.set(self.profile.name)
+    
+    def on_profile_selected(self, event=None):
+        profile = self.profiles[self.profile_combo.current()]
+        if profile.profile_id != self.profile.profile_id:
+            self.switch_profile(profile)
+    
+    def create_profile(self):
+        name = simpledialog.askstring("New Profile", "Profile name:", parent=self.root)
+        if not name:
+            return
+        try:
+            profile = self.profile_manager.create(name)
+        except ValueError:
+            messagebox.showerror("Invalid Name", "Please use letters or numbers in the profile name.")
+            return
+        self.switch_profile(profile)
+        self.update_profile_list()
+    
+    def switch_profile(self, profile):
+        """Save the current timer and load another profile's data"""
+        self.state_log.snapshot(self.timer)
+        self.profile_manager.set_active(profile.profile_id)
+        restored = self.load_profile(profile)
+        
+        self.profile_var.set(profile.name)
+        self.start_button.config(text="Resume" if restored else "Start", state='normal')
+        self.pause_button.config(state='disabled')
+        self.dashboard.session_manager = self.session_manager
+        self.dashboard.refresh()
+        self.update_display()
+    
     def open_settings(self):
         """Open the settings window"""
         SettingsWindow(self.root, self.timer, self.on_settings_updated)
@@ -138,8 +201,16 @@ class StudyTimerApp:
         self.pause_button.config(state='disabled')
         self.update_display()
     
+    def on_close(self):
+        self.state_log.snapshot(self.timer)
+        self.dashboard.chart_cache.close()
+        self.root.destroy()
+    
     def update_timer(self):
         if self.timer.is_running:
+            # update() moves on to the next phase when this one ends
+            finished_session = self.timer.current_session
+            finished_name = self.timer.get_session_info()['name']
             still_running = self.timer.update()
             
             if not still_running:
@@ -147,19 +218,18 @@ class StudyTimerApp:
                 session_info = self.timer.get_session_info()
                 
                 # Log completed session
-                if self.timer.current_session == "work":
+                if finished_session == "work":
                     duration = self.timer.work_duration // 60
                     self.session_manager.save_session("focus", duration, completed=True)
                 else:
-                    break_type = "short_break" if self.timer.current_session == "short_break" else "long_break"
-                    duration = (self.timer.short_break_duration if break_type == "short_break" 
+                    duration = (self.timer.short_break_duration if finished_session == "short_break" 
                                else self.timer.long_break_duration) // 60
-                    self.session_manager.save_session(break_type, duration, completed=True)
+                    self.session_manager.save_session(finished_session, duration, completed=True)
                 
                 self.play_sound()
                 messagebox.showinfo("Session Complete!", 
-                                  f"{session_info['name']} finished!\n"
-                                  f"Ready for {session_info['next_session']}?")
+                                  f"{finished_name} finished!\n"
+                                  f"Ready for {session_info['name']}?")
         
         self.update_display()
         self.root.after(1000, self.update_timer)  # Update every second
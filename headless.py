@@ -0,0 +1,190 @@
+"""Terminal front end for the timer.
+
+Runs PomodoroTimer and SessionManager without importing Tk, matplotlib or
+pygame, for kiosk and SSH-only machines:
+
+    python main.py --headless
+    python headless.py --autostart --auto-continue --plain
+
+Type a command and press Enter: s = start/resume, p = pause, k = skip,
+r = reset, q = quit.
+"""
+import argparse
+import queue
+import sys
+import threading
+import time
+from profiles import ProfileManager
+
+COMMANDS = {
+    's': 'start',
+    'p': 'pause',
+    'k': 'skip',
+    'r': 'reset',
+    'q': 'quit'
+}
+
+SESSION_TYPES = {
+    'work': 'focus',
+    'short_break': 'short_break',
+    'long_break': 'long_break'
+}
+
+class HeadlessTimerApp:
+    def __init__(self, profile, plain=False, quiet=False, auto_continue=False, out=sys.stdout):
+        self.plain = plain
+        self.quiet = quiet
+        self.auto_continue = auto_continue
+        self.out = out
+        self.commands = queue.Queue()
+        self.running = True
+
+        # Initialize components
+        self.profile = profile
+        self.timer = profile.create_timer()
+        self.state_log = self.timer.state_log
+        self.session_manager = profile.create_session_manager()
+        
+        # Pick up where the last run stopped
+        self.restored = self.state_log.restore(self.timer, self.session_manager)
+
+    def read_commands(self, stream=sys.stdin):
+        """Forward command lines from stream to the main loop"""
+        for line in stream:
+            command = COMMANDS.get(line.strip().lower()[:1])
+            if command:
+                self.commands.put(command)
+
+    def run(self, autostart=False):
+        """Tick the timer once per second until told to quit"""
+        reader = threading.Thread(target=self.read_commands, daemon=True)
+        reader.start()
+
+        status = "restored" if self.restored else "ready"
+        self.log(f"{self.timer.get_session_info()['name']} {status} "
+                 f"({self.timer.get_time_display()}) for profile {self.profile.name}")
+        if autostart:
+            self.handle_command('start')
+
+        next_tick = time.monotonic()
+        try:
+            while self.running:
+                self.process_commands()
+                if not self.running:
+                    break
+
+                self.tick()
+                self.show_status()
+
+                # Schedule against the monotonic clock so ticks do not drift
+                next_tick += 1
+                time.sleep(max(0, next_tick - time.monotonic()))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.state_log.snapshot(self.timer)
+            self.log("Timer stopped")
+
+    def process_commands(self):
+        while True:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            self.handle_command(command)
+
+    def handle_command(self, command):
+        if command == 'start':
+            self.timer.start()
+            self.log(f"Started {self.timer.get_session_info()['name']}")
+        elif command == 'pause':
+            self.timer.pause()
+            self.log("Paused")
+        elif command == 'skip':
+            old_session = self.timer.current_session
+            self.timer.skip()
+
+            # Log the skipped session as incomplete
+            if old_session == "work":
+                self.session_manager.save_session("focus", 0, completed=False, notes="Skipped")
+            self.log(f"Skipped to {self.timer.get_session_info()['name']}")
+            self.notify()
+        elif command == 'reset':
+            self.timer.reset()
+            self.log("Reset")
+        elif command == 'quit':
+            self.running = False
+
+    def tick(self):
+        """Advance the timer one second and log a session that just ended"""
+        if not self.timer.is_running:
+            return
+
+        finished_session = self.timer.current_session
+        if self.timer.update():
+            return
+
+        # Session ended naturally
+        durations = {
+            'work': self.timer.work_duration,
+            'short_break': self.timer.short_break_duration,
+            'long_break': self.timer.long_break_duration
+        }
+        self.session_manager.save_session(SESSION_TYPES[finished_session],
+                                          durations[finished_session] // 60,
+                                          completed=True)
+
+        session_info = self.timer.get_session_info()
+        self.log(f"Session complete! Next: {session_info['name']}")
+        self.notify()
+
+        if self.auto_continue:
+            self.timer.start()
+
+    def show_status(self):
+        if self.plain:
+            return
+        session_info = self.timer.get_session_info()
+        state = "running" if self.timer.is_running else "paused"
+        self.out.write(f"\r{session_info['name']:<12} {self.timer.get_time_display()} "
+                       f"{state:<8} completed: {session_info['completed_sessions']}  ")
+        self.out.flush()
+
+    def log(self, message):
+        prefix = "\n" if not self.plain else ""
+        self.out.write(f"{prefix}[{time.strftime('%H:%M:%S')}] {message}\n")
+        self.out.flush()
+
+    def notify(self):
+        """Ring the terminal bell unless notifications are suppressed"""
+        if not self.quiet:
+            self.out.write("\a")
+            self.out.flush()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the study timer in a terminal")
+    parser.add_argument('--autostart', action='store_true',
+                        help="start the first focus session immediately")
+    parser.add_argument('--auto-continue', action='store_true',
+                        help="start the next session as soon as one ends")
+    parser.add_argument('--plain', action='store_true',
+                        help="only log events, without a live status line")
+    parser.add_argument('--quiet', action='store_true',
+                        help="suppress notification bells")
+    parser.add_argument('--profile',
+                        help="profile to use, created if missing (default: last used profile)")
+    args = parser.parse_args(argv)
+
+    profile_manager = ProfileManager()
+    if args.profile:
+        profile = profile_manager.create(args.profile)
+        profile_manager.set_active(profile.profile_id)
+    else:
+        profile = profile_manager.get_active()
+
+    app = HeadlessTimerApp(profile, plain=args.plain or not sys.stdout.isatty(),
+                           quiet=args.quiet, auto_continue=args.auto_continue)
+    app.run(autostart=args.autostart)
+
+if __name__ == "__main__":
+    main()
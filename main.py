@@ -1,7 +1,15 @@
-from gui import StudyTimerApp
-import tkinter as tk
+import sys
 
 def main():
+    # The terminal front end must not pull in Tk, matplotlib or pygame
+    if '--headless' in sys.argv[1:]:
+        from headless import main as headless_main
+        headless_main([arg for arg in sys.argv[1:] if arg != '--headless'])
+        return
+    
+    import tkinter as tk
+    from gui import StudyTimerApp
+    
     # Create main window
     root = tk.Tk()
     
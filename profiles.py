@@ -0,0 +1,151 @@
+"""User profiles for machines shared by several students.
+
+The default profile keeps using the files directly under data/. Every other
+profile lives in its own directory under data/profiles/ with its own
+settings, monthly session shards, summary and timer state, so switching
+profiles only ever loads that one profile's data.
+
+    python profiles.py                 # focus minutes per profile this week
+    python profiles.py --week 2025-09-29
+"""
+import os
+import re
+import json
+import argparse
+import datetime
+from config import (PROFILES_DIR, SESSION_FILE, SETTINGS_FILE, STATS_FILE,
+                    TIMER_EVENTS_FILE, TIMER_SNAPSHOT_FILE, parse_date, start_of_week)
+from session_manager import (SessionManager, ShardedSessionManager, load_summary,
+                             summary_is_current)
+from storage import write_atomic
+from timer_logic import PomodoroTimer
+from timer_state import TimerStateLog
+
+DEFAULT_PROFILE = 'default'
+INDEX_FILE = 'profiles.json'
+
+def make_profile_id(name):
+    """Turn a display name into a directory-safe profile id"""
+    profile_id = re.sub(r'[^a-z0-9]+', '-', name.strip().lower()).strip('-')
+    if not profile_id:
+        raise ValueError(f"Invalid profile name: {name!r}")
+    return profile_id
+
+def week_dates(reference_date=None):
+    """Return the dates from Monday to Sunday of the week containing reference_date"""
+    week_start = start_of_week(reference_date)
+    return [(week_start + datetime.timedelta(days=i)).isoformat() for i in range(7)]
+
+class Profile:
+    def __init__(self, profile_id, name, directory=None):
+        self.profile_id = profile_id
+        self.name = name
+        self.directory = directory
+
+        if directory is None:
+            # The default profile uses the original single-user files
+            self.settings_file = SETTINGS_FILE
+            self.stats_file = STATS_FILE
+            self.timer_events_file = TIMER_EVENTS_FILE
+            self.timer_snapshot_file = TIMER_SNAPSHOT_FILE
+        else:
+            self.settings_file = os.path.join(directory, 'settings.json')
+            self.sessions_dir = os.path.join(directory, 'sessions')
+            self.summary_file = os.path.join(directory, 'summary.json')
+            self.stats_file = os.path.join(directory, 'stats.json')
+            self.timer_events_file = os.path.join(directory, 'timer_events.log')
+            self.timer_snapshot_file = os.path.join(directory, 'timer_snapshot.json')
+
+    def create_session_manager(self, read_only=False):
+        if self.directory is None:
+            return SessionManager(SESSION_FILE, self.stats_file, read_only)
+        return ShardedSessionManager(self.sessions_dir, self.summary_file, self.stats_file,
+                                     read_only)
+
+    def create_timer(self):
+        """Create a timer with this profile's settings and its state log attached"""
+        state_log = TimerStateLog(self.timer_events_file, self.timer_snapshot_file)
+        return PomodoroTimer(state_log, self.settings_file)
+
+    def load_summary(self):
+        """Load per-day totals without loading the sessions themselves"""
+        if self.directory is None:
+            return SessionManager(SESSION_FILE, read_only=True).get_summary()
+        summary = load_summary(self.summary_file)
+        if not summary_is_current(summary, self.sessions_dir):
+            # Never written, lost, or behind the shards after a crash:
+            # rebuild it in memory from the shards
+            summary = self.create_session_manager(read_only=True).get_summary()
+        return summary
+
+class ProfileManager:
+    def __init__(self, profiles_dir=PROFILES_DIR):
+        self.profiles_dir = profiles_dir
+        self.index_file = os.path.join(profiles_dir, INDEX_FILE)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'active': DEFAULT_PROFILE, 'profiles': {DEFAULT_PROFILE: 'Default'}}
+
+    def _save_index(self):
+        os.makedirs(self.profiles_dir, exist_ok=True)
+        write_atomic(self.index_file, json.dumps(self.index, indent=2))
+
+    def list_profiles(self):
+        return [self.get(profile_id) for profile_id in self.index['profiles']]
+
+    def get(self, profile_id):
+        if profile_id not in self.index['profiles']:
+            raise KeyError(f"Unknown profile: {profile_id}")
+        name = self.index['profiles'][profile_id]
+        if profile_id == DEFAULT_PROFILE:
+            return Profile(profile_id, name)
+        return Profile(profile_id, name, os.path.join(self.profiles_dir, profile_id))
+
+    def create(self, name):
+        """Create a profile, or return the existing one with the same id"""
+        profile_id = make_profile_id(name)
+        if profile_id not in self.index['profiles']:
+            os.makedirs(os.path.join(self.profiles_dir, profile_id), exist_ok=True)
+            self.index['profiles'][profile_id] = name.strip()
+            self._save_index()
+        return self.get(profile_id)
+
+    def get_active(self):
+        active = self.index.get('active', DEFAULT_PROFILE)
+        if active not in self.index['profiles']:
+            active = DEFAULT_PROFILE
+        return self.get(active)
+
+    def set_active(self, profile_id):
+        profile = self.get(profile_id)
+        self.index['active'] = profile_id
+        self._save_index()
+        return profile
+
+    def get_weekly_focus(self, reference_date=None):
+        """Get focus minutes per profile for the week containing reference_date"""
+        days = week_dates(reference_date)
+        totals = {}
+        for profile in self.list_profiles():
+            daily_focus = profile.load_summary()['daily_focus']
+            totals[profile.profile_id] = sum(daily_focus.get(day, 0) for day in days)
+        return totals
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show focus minutes per profile")
+    parser.add_argument('--week', type=parse_date,
+                        help="any date in the week to report (YYYY-MM-DD, default: this week)")
+    args = parser.parse_args(argv)
+
+    profile_manager = ProfileManager()
+    totals = profile_manager.get_weekly_focus(args.week)
+    for profile in profile_manager.list_profiles():
+        print(f"{profile.name:<24} {totals[profile.profile_id]:>6} min")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Headless weekly report generation.
+
+Renders the dashboard charts for one or more profiles or session files and
+weeks without starting the GUI, e.g.:
+
+    python report.py --week 2025-09-29 --week 2025-10-06 --format png pdf
+    python report.py --all-profiles
+"""
+import argparse
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')  # Never open a display, also in worker processes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from config import SESSION_FILE, REPORTS_DIR, parse_date, start_of_week
+from session_manager import SessionManager
+from profiles import ProfileManager
+from charts import (weekly_chart_data, distribution_chart_data,
+                    plot_weekly_chart, plot_distribution_chart)
+
+REPORT_FORMATS = ('png', 'pdf')
+
+def open_source(source):
+    """Return a report name and session manager for a ('file', path) or ('profile', id) source"""
+    # Reports only read, so stale derived files are rebuilt in memory and
+    # never written back from several processes at once
+    kind, value = source
+    if kind == 'profile':
+        profile = ProfileManager().get(value)
+        return profile.profile_id, profile.create_session_manager(read_only=True)
+    return os.path.splitext(os.path.basename(value))[0], SessionManager(value, read_only=True)
+
+def render_report(name, session_manager, week_start, formats, output_dir):
+    """Render one weekly report and return the paths written"""
+    weekly_stats = session_manager.get_weekly_stats(week_start)
+    week_sessions = session_manager.get_week_sessions(week_start)
+
+    fig = Figure(figsize=(10, 4), dpi=100)
+    weekly_ax = fig.add_subplot(1, 2, 1)
+    plot_weekly_chart(weekly_ax, weekly_chart_data(weekly_stats))
+
+    distribution_data = distribution_chart_data(week_sessions)
+    distribution_ax = fig.add_subplot(1, 2, 2)
+    if distribution_data:
+        plot_distribution_chart(distribution_ax, distribution_data)
+    else:
+        distribution_ax.axis('off')
+        distribution_ax.set_title('No sessions this week')
+
+    fig.suptitle(f"Week of {week_start.isoformat()} - "
+                 f"{weekly_stats['total_focus_minutes']} focus minutes")
+    fig.tight_layout()
+
+    canvas = FigureCanvasAgg(fig)
+    paths = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{name}_{week_start.isoformat()}.{fmt}")
+        canvas.print_figure(path, format=fmt)
+        paths.append(path)
+    return paths
+
+def render_source(source, week_starts, formats, output_dir):
+    """Load one source and render its report for every week"""
+    name, session_manager = open_source(source)
+    paths = []
+    for week_start in week_starts:
+        paths.extend(render_report(name, session_manager, week_start, formats, output_dir))
+    return paths
+
+def generate_reports(sources, weeks, formats=REPORT_FORMATS,
+                     output_dir=REPORTS_DIR, workers=None):
+    """Render a report for every source and week, one source per worker process"""
+    os.makedirs(output_dir, exist_ok=True)
+    week_starts = sorted({start_of_week(week) for week in weeks})
+
+    paths = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(render_source, source, week_starts, formats, output_dir)
+                   for source in sources]
+        for future in futures:
+            paths.extend(future.result())
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render weekly study reports without the GUI")
+    parser.add_argument('--sessions', nargs='+', default=[],
+                        help="session JSON files to report on")
+    parser.add_argument('--profile', action='append', default=[], dest='profiles',
+                        help="profile id to report on; repeatable")
+    parser.add_argument('--all-profiles', action='store_true',
+                        help="report on every profile")
+    parser.add_argument('--week', action='append', type=parse_date,
+                        help="any date in the week to report (YYYY-MM-DD); repeatable")
+    parser.add_argument('--format', nargs='+', choices=REPORT_FORMATS, default=['png'],
+                        dest='formats', help="output formats")
+    parser.add_argument('--output', default=REPORTS_DIR, help="directory for the reports")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    profile_manager = ProfileManager()
+    known_profiles = [profile.profile_id for profile in profile_manager.list_profiles()]
+    profiles = known_profiles if args.all_profiles else args.profiles
+    unknown = [profile_id for profile_id in profiles if profile_id not in known_profiles]
+    if unknown:
+        parser.error(f"unknown profile: {', '.join(unknown)} "
+                     f"(known: {', '.join(known_profiles)})")
+    sources = ([('file', path) for path in args.sessions]
+               + [('profile', profile_id) for profile_id in profiles])
+    if not sources:
+        sources = [('file', SESSION_FILE)]
+
+    weeks = args.week or [datetime.date.today()]
+    for path in generate_reports(sources, weeks, args.formats,
+                                 args.output, args.workers):
+        print(path)
+
+if __name__ == "__main__":
+    main()
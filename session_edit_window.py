@@ -0,0 +1,102 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+SESSION_TYPE_NAMES = {
+    'focus': 'Focus',
+    'short_break': 'Short Break',
+    'long_break': 'Long Break'
+}
+
+class SessionEditWindow:
+    def __init__(self, parent, session_manager, session, on_change):
+        self.parent = parent
+        self.session_manager = session_manager
+        self.session = session
+        self.on_change = on_change
+
+        self.create_window()
+
+    def create_window(self):
+        """Create the edit window"""
+        self.window = tk.Toplevel(self.parent)
+        self.window.title("Edit Session")
+        self.window.resizable(False, False)
+        self.window.transient(self.parent.winfo_toplevel())  # Set to be on top of parent
+        self.window.grab_set()  # Modal window
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        """Create edit widgets"""
+        main_frame = ttk.Frame(self.window, padding=20)
+        main_frame.pack(fill='both', expand=True)
+
+        # Title
+        ttk.Label(main_frame,
+                 text=f"Session on {self.session['date']} at {self.session['start_time']}",
+                 font=('Arial', 12, 'bold')).grid(row=0, column=0, columnspan=2, pady=(0, 15))
+
+        # Session type
+        ttk.Label(main_frame, text="Type:").grid(row=1, column=0, sticky='w', pady=5)
+        self.type_var = tk.StringVar(value=SESSION_TYPE_NAMES.get(self.session['session_type'],
+                                                                  self.session['session_type']))
+        ttk.Combobox(main_frame, textvariable=self.type_var, state='readonly', width=18,
+                     values=list(SESSION_TYPE_NAMES.values())).grid(row=1, column=1, sticky='e')
+
+        # Duration
+        ttk.Label(main_frame, text="Duration (minutes):").grid(row=2, column=0, sticky='w', pady=5)
+        self.duration_var = tk.StringVar(value=str(self.session['duration']))
+        ttk.Spinbox(main_frame, from_=0, to=600, width=8,
+                    textvariable=self.duration_var).grid(row=2, column=1, sticky='e')
+
+        # Completed
+        self.completed_var = tk.BooleanVar(value=self.session['completed'])
+        ttk.Checkbutton(main_frame, text="Completed",
+                        variable=self.completed_var).grid(row=3, column=0, columnspan=2,
+                                                          sticky='w', pady=5)
+
+        # Notes
+        ttk.Label(main_frame, text="Notes:").grid(row=4, column=0, sticky='w', pady=5)
+        self.notes_var = tk.StringVar(value=self.session['notes'])
+        ttk.Entry(main_frame, textvariable=self.notes_var, width=30).grid(row=4, column=1, sticky='e')
+
+        # Buttons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=5, column=0, columnspan=2, sticky='ew', pady=(20, 0))
+
+        ttk.Button(button_frame, text="Delete",
+                  command=self.delete_session).pack(side='left')
+        ttk.Button(button_frame, text="Cancel",
+                  command=self.window.destroy).pack(side='right', padx=(10, 0))
+        ttk.Button(button_frame, text="Save",
+                  command=self.save_session).pack(side='right')
+
+    def save_session(self):
+        """Save the corrected session"""
+        try:
+            duration = int(self.duration_var.get())
+            if duration < 0:
+                raise ValueError("Duration must not be negative")
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Please enter a valid duration in minutes.",
+                                 parent=self.window)
+            return
+
+        session_types = {name: session_type for session_type, name in SESSION_TYPE_NAMES.items()}
+        self.session_manager.update_session(
+            self.session['id'],
+            session_type=session_types.get(self.type_var.get(), self.session['session_type']),
+            duration=duration,
+            completed=self.completed_var.get(),
+            notes=self.notes_var.get()
+        )
+        self.window.destroy()
+        self.on_change()
+
+    def delete_session(self):
+        """Delete the session after confirmation"""
+        if not messagebox.askyesno("Delete Session", "Delete this session?", parent=self.window):
+            return
+        self.session_manager.delete_session(self.session['id'])
+        self.window.destroy()
+        self.on_change()
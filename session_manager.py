@@ -1,50 +1,233 @@
+import os
 import json
 import datetime
-from config import SESSION_FILE
+from itertools import islice
+from config import SESSION_FILE, parse_date, start_of_week
+from session_stats import SessionStats
+from storage import read_json_lines, append_json_line, write_atomic
+
+# Fields that can be corrected after a session was logged
+EDITABLE_FIELDS = ('session_type', 'duration', 'completed', 'notes')
+
+def empty_summary():
+    return {
+        'total_sessions': 0,
+        'total_focus_minutes': 0,
+        'daily_focus': {},
+        'daily_sessions': {}
+    }
+
+def add_to_summary(summary, session):
+    """Fold one session into per-day totals"""
+    day = session['date']
+    summary['total_sessions'] += 1
+    summary['daily_sessions'][day] = summary['daily_sessions'].get(day, 0) + 1
+    # daily_focus only lists days with focus minutes
+    if session['session_type'] == 'focus' and session['duration']:
+        summary['total_focus_minutes'] += session['duration']
+        summary['daily_focus'][day] = summary['daily_focus'].get(day, 0) + session['duration']
+
+def remove_from_summary(summary, session):
+    """Take one session back out of per-day totals"""
+    day = session['date']
+    summary['total_sessions'] -= 1
+    summary['daily_sessions'][day] -= 1
+    if session['session_type'] == 'focus' and session['duration']:
+        summary['total_focus_minutes'] -= session['duration']
+        summary['daily_focus'][day] -= session['duration']
+        if summary['daily_focus'][day] == 0:
+            del summary['daily_focus'][day]
+    if summary['daily_sessions'][day] == 0:
+        del summary['daily_sessions'][day]
+
+def build_summary(sessions):
+    """Compute per-day totals from scratch"""
+    summary = empty_summary()
+    for session in sessions:
+        add_to_summary(summary, session)
+    return summary
+
+def shard_sizes(sessions_dir):
+    """Size of every monthly shard, which changes with each record appended"""
+    try:
+        names = os.listdir(sessions_dir)
+    except FileNotFoundError:
+        return {}
+    return {name: os.path.getsize(os.path.join(sessions_dir, name))
+            for name in names if name.endswith('.jsonl')}
+
+def summary_is_current(summary, sessions_dir):
+    """Whether a summary was saved after the last record written to the shards"""
+    return summary is not None and summary.get('shards') == shard_sizes(sessions_dir)
+
+def load_summary(summary_file):
+    """Load a summary written by ShardedSessionManager, or None if missing"""
+    try:
+        with open(summary_file, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
 
 class SessionManager:
-    def __init__(self):
-        self.sessions = self.load_sessions()
+    """Sessions stored in a single JSON file.
+    
+    Edits and deletes are appended to a journal next to the file (deletes
+    as tombstones) and folded into the file the next time it is rewritten.
+    A read_only store never writes: stale statistics are only rebuilt in
+    memory and sessions cannot be added, edited or deleted.
+    """
+    
+    def __init__(self, session_file=SESSION_FILE, stats_file=None, read_only=False):
+        self.session_file = session_file
+        self.journal_file = session_file + '.journal' if session_file else None
+        self.stats_file = stats_file
+        self.read_only = read_only
+        
+        # Sessions by id, oldest first; ids are never reused
+        self.next_id = 1
+        # Number of records written to the store, so derived files can
+        # tell whether they include the latest add, edit or delete
+        self.version = 0
+        self.sessions_by_id = {}
+        for session in self.load_sessions():
+            self.sessions_by_id[session['id']] = session
+        
+        # Without a stats file the statistics are rebuilt on every load
+        self.stats = SessionStats.load(stats_file, self.sessions, self.version,
+                                       save=not read_only)
+    
+    @property
+    def sessions(self):
+        """Read-only view of all sessions, oldest first"""
+        return self.sessions_by_id.values()
+    
+    def _apply_record(self, sessions, record):
+        """Apply a stored session, edited session or tombstone to sessions"""
+        if record.get('deleted'):
+            sessions.pop(record['id'], None)
+        else:
+            sessions[record['id']] = record
+        self.next_id = max(self.next_id, record['id'] + 1)
     
     def load_sessions(self):
-        """Load sessions from JSON file"""
+        """Load sessions from JSON file and apply the journal"""
         try:
-            with open(SESSION_FILE, 'r') as f:
+            with open(self.session_file, 'r') as f:
                 data = json.load(f)
-                return data.get('sessions', [])
         except (FileNotFoundError, json.JSONDecodeError):
-            return []
+            data = {}
+        
+        metadata = data.get('metadata', {})
+        self.next_id = metadata.get('next_id', 1)
+        journal = read_json_lines(self.journal_file)
+        self.version = metadata.get('version', len(data.get('sessions', []))) + len(journal)
+        
+        sessions = {}
+        for record in data.get('sessions', []) + journal:
+            self._apply_record(sessions, record)
+        return list(sessions.values())
     
-    def save_session(self, session_type, duration, completed=True, notes=""):
-        """Save a new session to JSON"""
+    def save_session(self, session_type, duration, completed=True, notes="", timestamp=None):
+        """Save a new session to JSON, logged at timestamp (default: now)"""
+        self._check_writable()
+        if timestamp is None:
+            timestamp = datetime.datetime.now()
         session_data = {
-            "id": len(self.sessions) + 1,
-            "date": datetime.datetime.now().strftime("%Y-%m-%d"),
-            "start_time": datetime.datetime.now().strftime("%H:%M:%S"),
+            "id": self.next_id,
+            "date": timestamp.strftime("%Y-%m-%d"),
+            "start_time": timestamp.strftime("%H:%M:%S"),
             "session_type": session_type,
             "duration": duration,
             "completed": completed,
             "notes": notes,
-            "timestamp": datetime.datetime.now().isoformat()
+            "timestamp": timestamp.isoformat()
         }
         
-        self.sessions.append(session_data)
-        self._save_to_file()
+        self.next_id += 1
+        self.version += 1
+        self.sessions_by_id[session_data['id']] = session_data
+        self._store_session(session_data)
+        
+        self.stats.add(session_data)
+        self._save_stats()
         
         return session_data
     
+    def get_session(self, session_id):
+        """Get a session by id, or None if there is none"""
+        return self.sessions_by_id.get(session_id)
+    
+    def update_session(self, session_id, **changes):
+        """Correct fields of a logged session and return the updated session"""
+        unknown = set(changes) - set(EDITABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot edit {', '.join(sorted(unknown))}")
+        self._check_writable()
+        
+        old_session = self.sessions_by_id[session_id]
+        session = dict(old_session, **changes)
+        self.sessions_by_id[session_id] = session
+        self.version += 1
+        self._store_update(old_session, session)
+        self._update_stats(old_session, session)
+        return session
+    
+    def delete_session(self, session_id):
+        """Delete a session and return it"""
+        self._check_writable()
+        session = self.sessions_by_id.pop(session_id)
+        self.version += 1
+        self._store_delete(session)
+        self._update_stats(session, None)
+        return session
+    
+    def _check_writable(self):
+        if self.read_only:
+            raise RuntimeError("Session store was opened read-only")
+    
+    def _update_stats(self, old_session, session):
+        """Bring the statistics in line with an edited or deleted session"""
+        if session is None or any(old_session[field] != session[field]
+                                  for field in ('session_type', 'duration', 'completed')):
+            self.stats.replace(old_session, session, self.sessions)
+        # Saved even for notes-only edits, to record the new version
+        self._save_stats()
+    
+    def _save_stats(self):
+        self.stats.version = self.version
+        if self.stats_file is not None:
+            self.stats.save(self.stats_file)
+    
+    def _store_session(self, session_data):
+        """Persist a newly added session"""
+        self._save_to_file()
+    
+    def _store_update(self, old_session, session):
+        """Persist an edited session"""
+        append_json_line(self.journal_file, session)
+    
+    def _store_delete(self, session):
+        """Persist a deleted session as a tombstone"""
+        append_json_line(self.journal_file, {"id": session['id'], "deleted": True})
+    
     def _save_to_file(self):
         """Save all sessions to JSON file"""
         data = {
             "metadata": {
                 "last_updated": datetime.datetime.now().isoformat(),
-                "total_sessions": len(self.sessions)
+                "total_sessions": len(self.sessions_by_id),
+                "next_id": self.next_id,
+                "version": self.version
             },
-            "sessions": self.sessions
+            "sessions": list(self.sessions)
         }
         
-        with open(SESSION_FILE, 'w') as f:
+        with open(self.session_file, 'w') as f:
             json.dump(data, f, indent=2)
+        
+        # The file now contains every edit and delete from the journal
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
     
     def get_today_stats(self):
         """Get statistics for today"""
@@ -62,16 +245,9 @@ class SessionManager:
             'productivity_score': min(100, (total_focus_minutes / 120) * 100)  # Based on 2-hour goal
         }
     
-    def get_weekly_stats(self):
-        """Get statistics for the current week"""
-        today = datetime.datetime.now()
-        week_start = today - datetime.timedelta(days=today.weekday())
-        
-        week_sessions = []
-        for session in self.sessions:
-            session_date = datetime.datetime.strptime(session['date'], "%Y-%m-%d")
-            if session_date >= week_start:
-                week_sessions.append(session)
+    def get_weekly_stats(self, reference_date=None):
+        """Get statistics for the week containing reference_date (default: this week)"""
+        week_sessions = self.get_week_sessions(reference_date)
         
         focus_sessions = [s for s in week_sessions if s['session_type'] == 'focus']
         total_focus_minutes = sum(s['duration'] for s in focus_sessions)
@@ -89,6 +265,95 @@ class SessionManager:
             'average_daily_minutes': total_focus_minutes / 7 if week_sessions else 0
         }
     
+    def get_week_sessions(self, reference_date=None):
+        """Get the sessions from Monday to Sunday of the week containing reference_date"""
+        week_start = start_of_week(reference_date)
+        week_end = week_start + datetime.timedelta(days=7)
+        
+        week_sessions = []
+        for session in self.sessions:
+            session_date = parse_date(session['date'])
+            if week_start <= session_date < week_end:
+                week_sessions.append(session)
+        return week_sessions
+    
+    def get_summary(self):
+        """Get total and per-day session counts and focus minutes"""
+        return build_summary(self.sessions)
+    
     def get_session_history(self, limit=50):
         """Get recent session history"""
-        return self.sessions[-limit:] if self.sessions else []
\ No newline at end of file
+        recent = list(islice(reversed(self.sessions_by_id.values()), limit))
+        return recent[::-1]
+
+class ShardedSessionManager(SessionManager):
+    """Session store split into one JSON-lines file per month.
+    
+    Saving a session appends a single line to the current month's shard
+    instead of rewriting the whole history, and keeps a small summary file
+    with per-day totals up to date for cross-profile queries. Edits append
+    the updated session and deletes append a tombstone to the same shard;
+    the last line for an id wins when loading.
+    """
+    
+    def __init__(self, sessions_dir, summary_file, stats_file=None, read_only=False):
+        self.sessions_dir = sessions_dir
+        self.summary_file = summary_file
+        if not read_only:
+            os.makedirs(self.sessions_dir, exist_ok=True)
+        super().__init__(session_file=None, stats_file=stats_file, read_only=read_only)
+        
+        self.summary = load_summary(self.summary_file)
+        if (not summary_is_current(self.summary, self.sessions_dir)
+                or self.summary.get('version') != self.version):
+            # Missing or out of date after a crash, rebuild it from the shards
+            self.summary = build_summary(self.sessions)
+            if not read_only:
+                self._save_summary()
+    
+    def _shard_path(self, session):
+        return os.path.join(self.sessions_dir, f"{session['date'][:7]}.jsonl")
+    
+    def load_sessions(self):
+        """Load sessions from all monthly shards, oldest first"""
+        sessions = {}
+        if not os.path.isdir(self.sessions_dir):
+            return []
+        for name in sorted(os.listdir(self.sessions_dir)):
+            if not name.endswith('.jsonl'):
+                continue
+            for record in read_json_lines(os.path.join(self.sessions_dir, name)):
+                self._apply_record(sessions, record)
+                self.version += 1
+        return list(sessions.values())
+    
+    def _store_session(self, session_data):
+        """Append the session to its month's shard and update the summary"""
+        append_json_line(self._shard_path(session_data), session_data)
+        
+        add_to_summary(self.summary, session_data)
+        self._save_summary()
+    
+    def _store_update(self, old_session, session):
+        """Append the edited session to its shard and update the summary"""
+        append_json_line(self._shard_path(session), session)
+        
+        remove_from_summary(self.summary, old_session)
+        add_to_summary(self.summary, session)
+        self._save_summary()
+    
+    def _store_delete(self, session):
+        """Append a tombstone to the session's shard and update the summary"""
+        append_json_line(self._shard_path(session), {"id": session['id'], "deleted": True})
+        
+        remove_from_summary(self.summary, session)
+        self._save_summary()
+    
+    def _save_summary(self):
+        self.summary['version'] = self.version
+        self.summary['shards'] = shard_sizes(self.sessions_dir)
+        write_atomic(self.summary_file, json.dumps(self.summary))
+    
+    def get_summary(self):
+        """Get total and per-day session counts and focus minutes"""
+        return self.summary
\ No newline at end of file
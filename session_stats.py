@@ -0,0 +1,376 @@
+"""Streaming statistics over the session history.
+
+SessionStats is updated with every saved session and keeps its state in a
+few numbers, so the trends shown on the dashboard never need a pass over
+the whole history:
+
+- an exponentially weighted average of daily focus minutes
+- mean, spread, median and 90th percentile of focus session length
+  (Welford's algorithm and the P-square quantile estimator)
+- short and long term skip rates, whose difference is the skip trend
+
+Run ``python session_stats.py --verify`` to compare the streaming values
+with an exact computation over the full history.
+"""
+import json
+import math
+import argparse
+import datetime
+from config import parse_date
+from storage import write_atomic
+
+# Smoothing factors: daily focus over roughly a week, skip rate over the
+# last few sessions (short) and the last few dozen sessions (long)
+FOCUS_ALPHA = 0.25
+SKIP_SHORT_ALPHA = 0.3
+SKIP_LONG_ALPHA = 0.05
+
+# Thresholds for anomaly flags
+LENGTH_Z_THRESHOLD = 3.0
+SKIP_TREND_THRESHOLD = 0.2
+
+class RunningStats:
+    """Mean and variance in constant memory (Welford's algorithm)"""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value):
+        """Undo add(value) exactly"""
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        mean = (self.count * self.mean - value) / (self.count - 1)
+        self.m2 = max(0.0, self.m2 - (value - self.mean) * (value - mean))
+        self.mean = mean
+        self.count -= 1
+
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def std(self):
+        return math.sqrt(self.variance())
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2}
+
+class P2Quantile:
+    """Quantile estimate in constant memory (Jain & Chlamtac's P-square algorithm)"""
+
+    def __init__(self, p, heights=None, positions=None, desired=None):
+        self.p = p
+        # Marker heights; holds the raw observations until there are five
+        self.heights = heights if heights is not None else []
+        self.positions = positions if positions is not None else [1, 2, 3, 4, 5]
+        self.desired = desired if desired is not None else [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, value):
+        heights = self.heights
+        if len(heights) < 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        # Find the cell the value falls into, extending the extremes if needed
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = 0
+            while value >= heights[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Move the three middle markers towards their desired positions
+        for i in range(1, 4):
+            offset = self.desired[i] - self.positions[i]
+            if ((offset >= 1 and self.positions[i + 1] - self.positions[i] > 1) or
+                    (offset <= -1 and self.positions[i - 1] - self.positions[i] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                self.positions[i] += step
+
+    def _parabolic(self, i, step):
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def _linear(self, i, step):
+        q, n = self.heights, self.positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+    def value(self):
+        if not self.heights:
+            return 0.0
+        if len(self.heights) < 5:
+            return exact_quantile(self.heights, self.p)
+        return self.heights[2]
+
+    def to_dict(self):
+        return {'p': self.p, 'heights': self.heights, 'positions': self.positions,
+                'desired': self.desired}
+
+def exact_quantile(values, p):
+    """Quantile of values with linear interpolation between closest ranks"""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    rank = p * (len(values) - 1)
+    lower = math.floor(rank)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+def is_length_sample(session):
+    """Whether a session counts towards the session length statistics"""
+    return session['session_type'] == 'focus' and session['duration'] > 0
+
+def ewma(previous, value, alpha):
+    return value if previous is None else alpha * value + (1 - alpha) * previous
+
+class SessionStats:
+    def __init__(self, state=None):
+        state = state or {}
+        # Version of the session store these stats were computed from
+        self.version = state.get('version')
+        self.lengths = RunningStats(**state.get('lengths', {}))
+        self.median = P2Quantile(**state.get('median', {'p': 0.5}))
+        self.p90 = P2Quantile(**state.get('p90', {'p': 0.9}))
+        self.last_length = state.get('last_length')
+
+        # Daily focus: the current day is summed up and folded into the
+        # average once a session from a later day arrives
+        self.focus_ewma = state.get('focus_ewma')
+        self.current_day = state.get('current_day')
+        self.current_day_minutes = state.get('current_day_minutes', 0)
+
+        self.skip_short = state.get('skip_short')
+        self.skip_long = state.get('skip_long')
+
+    @classmethod
+    def from_sessions(cls, sessions):
+        stats = cls()
+        for session in sessions:
+            stats.add(session)
+        return stats
+
+    @classmethod
+    def load(cls, stats_file, sessions, version, save=True):
+        """Load saved stats, rebuilding them unless they match the store's version.
+
+        Rebuilt stats are written back to stats_file unless save is False.
+        """
+        if stats_file is not None:
+            try:
+                with open(stats_file, 'r') as f:
+                    stats = cls(json.load(f))
+                if stats.version == version:
+                    return stats
+            except (FileNotFoundError, json.JSONDecodeError, TypeError):
+                pass
+
+        stats = cls.from_sessions(sessions)
+        stats.version = version
+        if stats_file is not None and save:
+            stats.save(stats_file)
+        return stats
+
+    def save(self, stats_file):
+        write_atomic(stats_file, json.dumps(self.to_dict()))
+
+    def to_dict(self):
+        return {
+            'version': self.version,
+            'lengths': self.lengths.to_dict(),
+            'median': self.median.to_dict(),
+            'p90': self.p90.to_dict(),
+            'last_length': self.last_length,
+            'focus_ewma': self.focus_ewma,
+            'current_day': self.current_day,
+            'current_day_minutes': self.current_day_minutes,
+            'skip_short': self.skip_short,
+            'skip_long': self.skip_long
+        }
+
+    def add(self, session):
+        """Update every statistic with one new session"""
+        if is_length_sample(session):
+            self.lengths.add(session['duration'])
+        self._add_ordered(session)
+
+    def replace(self, old_session, session, sessions):
+        """Update the statistics for an edited (or, if session is None, deleted) session.
+
+        Mean and variance are corrected in place. Quantile and EWMA states
+        cannot take a value back out, so those are replayed from sessions,
+        which must already include the change.
+        """
+        if is_length_sample(old_session):
+            self.lengths.remove(old_session['duration'])
+        if session is not None and is_length_sample(session):
+            self.lengths.add(session['duration'])
+
+        self.median = P2Quantile(0.5)
+        self.p90 = P2Quantile(0.9)
+        self.last_length = None
+        self.focus_ewma = self.current_day = None
+        self.current_day_minutes = 0
+        self.skip_short = self.skip_long = None
+        for entry in sessions:
+            self._add_ordered(entry)
+
+    def _add_ordered(self, session):
+        """Update the statistics that depend on the order of sessions"""
+        self._add_day(session)
+
+        if session['session_type'] != 'focus':
+            return
+
+        skipped = 0 if session['completed'] else 1
+        self.skip_short = ewma(self.skip_short, skipped, SKIP_SHORT_ALPHA)
+        self.skip_long = ewma(self.skip_long, skipped, SKIP_LONG_ALPHA)
+
+        if is_length_sample(session):
+            self.median.add(session['duration'])
+            self.p90.add(session['duration'])
+            self.last_length = session['duration']
+
+    def _add_day(self, session):
+        day = session['date']
+        if self.current_day is None:
+            self.current_day = day
+        elif day > self.current_day:
+            self.focus_ewma = self._fold_days(day)
+            self.current_day = day
+            self.current_day_minutes = 0
+        # Sessions dated before the current day are counted towards it
+
+        if session['session_type'] == 'focus':
+            self.current_day_minutes += session['duration']
+
+    def _fold_days(self, until_day):
+        """Average including the current day and the empty days before until_day"""
+        value = ewma(self.focus_ewma, self.current_day_minutes, FOCUS_ALPHA)
+        gap = (parse_date(until_day) - parse_date(self.current_day)).days - 1
+        return value * (1 - FOCUS_ALPHA) ** max(gap, 0)
+
+    def get_metrics(self, today=None):
+        """Get the current trends and anomaly flags"""
+        if today is None:
+            today = datetime.date.today()
+        today = today.isoformat()
+
+        # Average over complete days only, i.e. up to yesterday
+        focus_ewma = self.focus_ewma
+        if self.current_day is not None and self.current_day < today:
+            focus_ewma = self._fold_days(today)
+
+        skip_rate = self.skip_short or 0.0
+        skip_trend = skip_rate - (self.skip_long or 0.0)
+
+        anomalies = []
+        std = self.lengths.std()
+        if (self.last_length is not None and self.lengths.count > 5 and std > 0 and
+                abs(self.last_length - self.lengths.mean) / std > LENGTH_Z_THRESHOLD):
+            anomalies.append("Last session length is unusual")
+        if skip_trend > SKIP_TREND_THRESHOLD:
+            anomalies.append("Skipping more sessions than usual")
+
+        return {
+            'ewma_daily_focus': focus_ewma or 0.0,
+            'mean_session_length': self.lengths.mean,
+            'std_session_length': std,
+            'median_session_length': self.median.value(),
+            'p90_session_length': self.p90.value(),
+            'skip_rate': skip_rate,
+            'skip_trend': skip_trend,
+            'anomalies': anomalies
+        }
+
+def exact_metrics(sessions, today=None):
+    """Compute the same metrics as SessionStats with a full pass over sessions"""
+    if today is None:
+        today = datetime.date.today()
+
+    focus = [s for s in sessions if s['session_type'] == 'focus']
+    lengths = [s['duration'] for s in focus if s['duration'] > 0]
+    mean = sum(lengths) / len(lengths) if lengths else 0.0
+    variance = (sum((x - mean) ** 2 for x in lengths) / (len(lengths) - 1)
+                if len(lengths) > 1 else 0.0)
+
+    daily_focus = {}
+    for session in sessions:
+        minutes = session['duration'] if session['session_type'] == 'focus' else 0
+        daily_focus[session['date']] = daily_focus.get(session['date'], 0) + minutes
+    focus_ewma = None
+    if daily_focus:
+        day = parse_date(min(daily_focus))
+        while day < today:
+            focus_ewma = ewma(focus_ewma, daily_focus.get(day.isoformat(), 0), FOCUS_ALPHA)
+            day += datetime.timedelta(days=1)
+
+    skip_short = skip_long = None
+    for session in focus:
+        skipped = 0 if session['completed'] else 1
+        skip_short = ewma(skip_short, skipped, SKIP_SHORT_ALPHA)
+        skip_long = ewma(skip_long, skipped, SKIP_LONG_ALPHA)
+
+    return {
+        'ewma_daily_focus': focus_ewma or 0.0,
+        'mean_session_length': mean,
+        'std_session_length': math.sqrt(variance),
+        'median_session_length': exact_quantile(lengths, 0.5),
+        'p90_session_length': exact_quantile(lengths, 0.9),
+        'skip_rate': skip_short or 0.0,
+        'skip_trend': (skip_short or 0.0) - (skip_long or 0.0)
+    }
+
+def verify(session_manager, today=None):
+    """Return (streaming, exact) pairs for every metric"""
+    streaming = session_manager.stats.get_metrics(today)
+    exact = exact_metrics(session_manager.sessions, today)
+    return {name: (streaming[name], exact[name]) for name in exact}
+
+def main(argv=None):
+    # Imported here so the module itself stays free of storage dependencies
+    from profiles import ProfileManager
+
+    parser = argparse.ArgumentParser(description="Show streaming session statistics")
+    parser.add_argument('--profile', help="profile id (default: last used profile)")
+    parser.add_argument('--verify', action='store_true',
+                        help="compare with an exact computation over the full history")
+    args = parser.parse_args(argv)
+
+    profile_manager = ProfileManager()
+    profile = profile_manager.get(args.profile) if args.profile else profile_manager.get_active()
+    session_manager = profile.create_session_manager(read_only=True)
+
+    if args.verify:
+        print(f"{'metric':<24} {'streaming':>10} {'exact':>10}")
+        for name, (streaming, exact) in verify(session_manager).items():
+            print(f"{name:<24} {streaming:>10.2f} {exact:>10.2f}")
+    else:
+        for name, value in session_manager.stats.get_metrics().items():
+            print(f"{name:<24} {value}")
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ class SettingsWindow:
         self.parent = parent
         self.timer = timer
         self.on_settings_save = on_settings_save
-        self.settings = load_settings()
+        self.settings = load_settings(timer.settings_file)
         
         self.create_window()
     
@@ -131,7 +131,7 @@ class SettingsWindow:
                 new_settings['sessions_before_long_break'] < 1):
                 raise ValueError("All values must be positive")
             
-            save_settings(new_settings)
+            save_settings(new_settings, self.timer.settings_file)
             self.timer.update_settings(new_settings)
             self.on_settings_save()
             self.window.destroy()
@@ -0,0 +1,67 @@
+"""Crash-safe file helpers shared by the session store, statistics, timer
+state log, profile index and chart cache."""
+import os
+import json
+import tempfile
+
+def write_atomic(path, data, sync=False):
+    """Replace path with data (str or bytes) so readers never see a partial file.
+
+    The data goes to a uniquely named temporary file in the same directory
+    first, so concurrent writers never clobber each other's temporary file.
+    """
+    directory, name = os.path.split(path)
+    fd, temp_file = tempfile.mkstemp(dir=directory or '.', prefix=name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb' if isinstance(data, bytes) else 'w') as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_file, path)
+    except BaseException:
+        try:
+            os.remove(temp_file)
+        except FileNotFoundError:
+            pass
+        raise
+
+def read_json_lines(path):
+    """Read one JSON record per line, skipping lines torn by a crash"""
+    records = []
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+def truncate_partial_line(f):
+    """Cut off a line left without its newline, so the next append starts cleanly"""
+    end = f.seek(0, os.SEEK_END)
+    position = end
+    while position > 0:
+        start = max(0, position - 4096)
+        f.seek(start)
+        chunk = f.read(position - start)
+        newline = chunk.rfind(b"\n")
+        if newline != -1:
+            if start + newline + 1 != end:
+                f.truncate(start + newline + 1)
+            return
+        position = start
+    f.truncate(0)
+
+def append_json_line(path, record, sync=False):
+    """Append one JSON record as a line, fsyncing it if sync is set"""
+    with open(path, 'ab+') as f:
+        truncate_partial_line(f)
+        f.seek(0, os.SEEK_END)
+        f.write((json.dumps(record) + "\n").encode('utf-8'))
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
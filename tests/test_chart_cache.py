@@ -0,0 +1,58 @@
+import os
+from chart_cache import ChartCache
+
+def test_least_recently_used_image_is_evicted(tmp_path):
+    cache = ChartCache(str(tmp_path), max_entries=2)
+    cache.put('a', b'image a')
+    cache.put('b', b'image b')
+    assert cache.get('a') == b'image a'
+    cache.put('c', b'image c')
+
+    assert list(cache.entries) == ['a', 'c']
+    assert cache.get('b') is None
+    assert not os.path.exists(os.path.join(str(tmp_path), 'b.png'))
+
+def test_order_after_hits_is_saved_on_close(tmp_path):
+    cache = ChartCache(str(tmp_path), max_entries=3)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, f"image {key}".encode())
+    cache.get('a')
+    cache.close()
+
+    # A smaller cache keeps the most recently used images from the last run
+    cache = ChartCache(str(tmp_path), max_entries=2)
+    assert list(cache.entries) == ['c', 'a']
+    assert cache.get('a') == b'image a'
+    assert not os.path.exists(os.path.join(str(tmp_path), 'b.png'))
+
+def test_hits_do_not_write_the_index(tmp_path):
+    cache = ChartCache(str(tmp_path))
+    cache.put('a', b'image a')
+    cache.put('b', b'image b')
+    index_file = os.path.join(str(tmp_path), 'index.json')
+    saved = open(index_file).read()
+
+    cache.get('a')
+    assert open(index_file).read() == saved
+
+def test_image_removed_from_disk_is_a_miss(tmp_path):
+    cache = ChartCache(str(tmp_path))
+    cache.put('a', b'image a')
+
+    cache = ChartCache(str(tmp_path))
+    os.remove(os.path.join(str(tmp_path), 'a.png'))
+    assert cache.get('a') is None
+    assert 'a' not in cache.entries
+
+def test_get_or_render_renders_once(tmp_path):
+    cache = ChartCache(str(tmp_path))
+    calls = []
+
+    def render(chart_type, data):
+        calls.append(chart_type)
+        return b'image'
+
+    assert cache.get_or_render('weekly', [['2025-09-29', 25]], render) == b'image'
+    assert cache.get_or_render('weekly', [['2025-09-29', 25]], render) == b'image'
+    assert cache.get_or_render('weekly', [['2025-09-29', 30]], render) == b'image'
+    assert calls == ['weekly', 'weekly']
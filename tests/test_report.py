@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_report_does_not_import_tk():
+    pytest.importorskip('matplotlib')
+    code = "import sys, report; print('tkinter' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+def test_unknown_profile_is_a_usage_error(tmp_path, capsys):
+    pytest.importorskip('matplotlib')
+    import report
+    with pytest.raises(SystemExit) as exit_info:
+        report.main(['--profile', 'no-such-profile', '--output', str(tmp_path)])
+    assert exit_info.value.code == 2
+    assert 'unknown profile: no-such-profile' in capsys.readouterr().err
+
+def test_render_report_writes_png(tmp_path):
+    pytest.importorskip('matplotlib')
+    import report
+    from config import start_of_week
+    from session_manager import SessionManager
+    session_manager = SessionManager(str(tmp_path / 'sessions.json'))
+    session_manager.save_session('focus', 25)
+    session_manager.save_session('short_break', 5)
+
+    week_start = start_of_week()
+    [path] = report.render_report('test', session_manager, week_start, ['png'], str(tmp_path))
+    assert path == os.path.join(str(tmp_path), f"test_{week_start.isoformat()}.png")
+    with open(path, 'rb') as f:
+        assert f.read(8) == b'\x89PNG\r\n\x1a\n'
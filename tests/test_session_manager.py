@@ -0,0 +1,114 @@
+import os
+import json
+import random
+import datetime
+import pytest
+from session_manager import ShardedSessionManager, build_summary
+
+def open_store(tmp_path):
+    return ShardedSessionManager(str(tmp_path / 'sessions'), str(tmp_path / 'summary.json'),
+                                 str(tmp_path / 'stats.json'))
+
+def test_torn_line_does_not_lose_later_sessions(tmp_path):
+    store = open_store(tmp_path)
+    first = store.save_session('focus', 25)
+
+    # Simulate a crash halfway through writing a line
+    shard = os.path.join(store.sessions_dir, os.listdir(store.sessions_dir)[0])
+    with open(shard, 'a') as f:
+        f.write('{"id": 2, "date": "20')
+
+    store = open_store(tmp_path)
+    second = store.save_session('focus', 30)
+    third = store.save_session('short_break', 5)
+
+    store = open_store(tmp_path)
+    assert [s['id'] for s in store.sessions] == [first['id'], second['id'], third['id']]
+    assert len({first['id'], second['id'], third['id']}) == 3
+    assert store.next_id == third['id'] + 1
+    assert store.get_summary()['total_focus_minutes'] == 55
+
+def test_unparseable_line_in_the_middle_is_skipped(tmp_path):
+    store = open_store(tmp_path)
+    store.save_session('focus', 25)
+    shard = os.path.join(store.sessions_dir, os.listdir(store.sessions_dir)[0])
+    with open(shard, 'a') as f:
+        f.write('not json\n')
+    store.save_session('focus', 30)
+
+    store = open_store(tmp_path)
+    assert [s['duration'] for s in store.sessions] == [25, 30]
+
+def test_stale_summary_and_stats_are_rebuilt_after_an_edit(tmp_path):
+    store = open_store(tmp_path)
+    session = store.save_session('focus', 25)
+    store.save_session('focus', 35)
+    summary = open(store.summary_file).read()
+    stats = open(store.stats_file).read()
+
+    # Crash after the edit reached the shard but before the derived files
+    store.update_session(session['id'], duration=45)
+    open(store.summary_file, 'w').write(summary)
+    open(store.stats_file, 'w').write(stats)
+
+    store = open_store(tmp_path)
+    assert store.get_summary()['total_focus_minutes'] == 80
+    assert store.stats.lengths.mean == 40
+
+def test_journal_edits_survive_reload(tmp_path):
+    from session_manager import SessionManager
+    session_file = str(tmp_path / 'sessions.json')
+    stats_file = str(tmp_path / 'stats.json')
+    store = SessionManager(session_file, stats_file)
+    first = store.save_session('focus', 25)
+    store.save_session('focus', 30)
+    stats = open(stats_file).read()
+    store.delete_session(first['id'])
+    open(stats_file, 'w').write(stats)
+
+    store = SessionManager(session_file, stats_file)
+    assert [s['duration'] for s in store.sessions] == [30]
+    assert store.stats.lengths.count == 1
+    assert store.save_session('focus', 20)['id'] == 3
+
+def test_read_only_store_does_not_write_derived_files(tmp_path):
+    store = open_store(tmp_path)
+    store.save_session('focus', 25)
+    os.remove(store.summary_file)
+    os.remove(store.stats_file)
+
+    store = ShardedSessionManager(str(tmp_path / 'sessions'), str(tmp_path / 'summary.json'),
+                                  str(tmp_path / 'stats.json'), read_only=True)
+    assert store.get_summary()['total_focus_minutes'] == 25
+    assert store.stats.lengths.mean == 25
+    assert sorted(os.listdir(tmp_path)) == ['sessions']
+    with pytest.raises(RuntimeError):
+        store.save_session('focus', 30)
+
+def test_incremental_summary_matches_rebuild(tmp_path):
+    store = open_store(tmp_path)
+    rng = random.Random(7)
+    for _ in range(60):
+        store.save_session(rng.choice(['focus', 'short_break']), rng.randint(0, 3),
+                           timestamp=datetime.datetime(2025, 9, rng.randint(1, 30), 9))
+    for session in list(store.sessions):
+        if rng.random() < 0.4:
+            store.delete_session(session['id'])
+        elif rng.random() < 0.5:
+            store.update_session(session['id'], duration=rng.randint(0, 3))
+
+    expected = build_summary(store.sessions)
+    assert {key: store.get_summary()[key] for key in expected} == expected
+
+def test_profile_summary_is_rebuilt_after_a_crash(tmp_path):
+    from profiles import Profile
+    profile = Profile('test', 'Test', str(tmp_path))
+    store = profile.create_session_manager()
+    session = store.save_session('focus', 25)
+
+    # Crash after the shard append but before the summary was saved
+    shard = os.path.join(store.sessions_dir, os.listdir(store.sessions_dir)[0])
+    with open(shard, 'a') as f:
+        f.write(json.dumps(dict(session, id=2, duration=30)) + '\n')
+
+    assert profile.load_summary()['daily_focus'] == {session['date']: 55}
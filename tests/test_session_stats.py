@@ -0,0 +1,32 @@
+import pytest
+from session_stats import RunningStats, SessionStats
+
+def test_running_stats_remove_undoes_add():
+    stats = RunningStats()
+    for value in (25, 30, 45, 10):
+        stats.add(value)
+    stats.remove(45)
+
+    expected = RunningStats()
+    for value in (25, 30, 10):
+        expected.add(value)
+    assert stats.count == expected.count
+    assert stats.mean == pytest.approx(expected.mean)
+    assert stats.variance() == pytest.approx(expected.variance())
+
+def test_replace_matches_rebuild():
+    sessions = [
+        {'date': '2025-09-29', 'session_type': 'focus', 'duration': 25, 'completed': True},
+        {'date': '2025-09-29', 'session_type': 'focus', 'duration': 0, 'completed': False},
+        {'date': '2025-09-30', 'session_type': 'focus', 'duration': 40, 'completed': True},
+    ]
+    stats = SessionStats.from_sessions(sessions)
+
+    edited = dict(sessions[2], duration=30)
+    sessions[2] = edited
+    stats.replace({'date': '2025-09-30', 'session_type': 'focus', 'duration': 40,
+                   'completed': True}, edited, sessions)
+
+    rebuilt = SessionStats.from_sessions(sessions)
+    assert stats.lengths.mean == pytest.approx(rebuilt.lengths.mean)
+    assert stats.get_metrics() == pytest.approx(rebuilt.get_metrics())
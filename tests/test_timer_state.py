@@ -0,0 +1,103 @@
+import json
+import time
+import datetime
+from config import RECOVERY_TIMEOUT
+from session_manager import SessionManager
+from timer_logic import PomodoroTimer
+from timer_state import TimerStateLog
+
+def make_timer(tmp_path):
+    state_log = TimerStateLog(str(tmp_path / 'events.log'), str(tmp_path / 'snapshot.json'))
+    return PomodoroTimer(state_log, str(tmp_path / 'settings.json')), state_log
+
+def restore(tmp_path, session_manager=None):
+    """Restore into a fresh timer, as on the next start of the app"""
+    timer, state_log = make_timer(tmp_path)
+    assert state_log.restore(timer, session_manager)
+    return timer
+
+def test_events_after_the_snapshot_are_replayed(tmp_path):
+    timer, state_log = make_timer(tmp_path)
+    timer.start()
+    timer.time_remaining -= 100
+    state_log.snapshot(timer)
+    timer.time_remaining -= 200
+    timer.skip()
+    timer.start()
+
+    timer = restore(tmp_path)
+    assert timer.current_session == "short_break"
+    assert timer.time_remaining == timer.short_break_duration
+    assert timer.session_count == 1
+    assert not timer.is_running
+
+def test_events_covered_by_the_snapshot_are_skipped(tmp_path):
+    timer, state_log = make_timer(tmp_path)
+    timer.start()
+    timer.skip()
+    events = open(state_log.events_file).read()
+
+    # Crash after the snapshot was replaced but before the log was truncated
+    state_log.snapshot(timer)
+    with open(state_log.events_file, 'w') as f:
+        f.write(events)
+
+    timer = restore(tmp_path)
+    assert timer.current_session == "short_break"
+    assert timer.session_count == 1
+
+def test_torn_last_event_is_ignored(tmp_path):
+    timer, state_log = make_timer(tmp_path)
+    timer.start()
+    timer.skip()
+    with open(state_log.events_file, 'a') as f:
+        f.write('{"n": 3, "e": "sk')
+
+    timer = restore(tmp_path)
+    assert timer.current_session == "short_break"
+    assert timer.state_log.sequence == 2
+
+    # Later transitions are logged and replayed normally again
+    timer.skip()
+    timer = restore(tmp_path)
+    assert timer.current_session == "work"
+
+def test_running_focus_is_resumed_paused_within_timeout(tmp_path):
+    session_manager = SessionManager(str(tmp_path / 'sessions.json'))
+    timer, state_log = make_timer(tmp_path)
+    timer.start()
+    timer.time_remaining = timer.work_duration - 300
+    state_log.snapshot(timer)
+
+    timer = restore(tmp_path, session_manager)
+    assert timer.current_session == "work"
+    assert timer.time_remaining == timer.work_duration - 300
+    assert not timer.is_running
+    assert not list(session_manager.sessions)
+
+def test_running_focus_is_logged_as_interrupted_after_timeout(tmp_path):
+    session_manager = SessionManager(str(tmp_path / 'sessions.json'))
+    timer, state_log = make_timer(tmp_path)
+    timer.start()
+    timer.time_remaining = timer.work_duration - 300
+    state_log.snapshot(timer)
+
+    # The app was last seen running longer ago than the recovery timeout
+    with open(state_log.snapshot_file) as f:
+        snapshot = json.load(f)
+    last_seen = time.time() - RECOVERY_TIMEOUT - 60
+    snapshot['t'] = last_seen
+    with open(state_log.snapshot_file, 'w') as f:
+        json.dump(snapshot, f)
+
+    timer = restore(tmp_path, session_manager)
+    assert timer.current_session == "work"
+    assert timer.time_remaining == timer.work_duration
+    assert not timer.is_running
+
+    [session] = session_manager.sessions
+    assert session['session_type'] == "focus"
+    assert session['duration'] == 5
+    assert not session['completed']
+    assert session['notes'] == "Interrupted"
+    assert session['timestamp'] == datetime.datetime.fromtimestamp(last_seen - 300).isoformat()
@@ -1,13 +1,23 @@
 import time
 import threading
-from config import load_settings
+from config import load_settings, SETTINGS_FILE
 
 class PomodoroTimer:
-    def __init__(self):
-        self.settings = load_settings()
+    def __init__(self, state_log=None, settings_file=SETTINGS_FILE):
+        self.settings_file = settings_file
+        self.settings = load_settings(settings_file)
+        self.state_log = None
         self.reset()
+        # Attach after the initial reset so only real transitions are logged
+        self.state_log = state_log
+    
+    def _record(self, action):
+        """Append a transition to the state log, if one is attached"""
+        if self.state_log is not None:
+            self.state_log.record(action, self)
     
     def reset(self):
+        self._record('reset')
         self.work_duration = self.settings['work_duration'] * 60  # Convert to seconds
         self.short_break_duration = self.settings['short_break_duration'] * 60
         self.long_break_duration = self.settings['long_break_duration'] * 60
@@ -25,12 +35,15 @@ class PomodoroTimer:
         self.reset()
     
     def start(self):
+        self._record('start')
         self.is_running = True
     
     def pause(self):
+        self._record('pause')
         self.is_running = False
     
     def skip(self):
+        self._record('skip')
         self.is_running = False
         if self.current_session == "work":
             self.session_count += 1
@@ -48,6 +61,8 @@ class PomodoroTimer:
     def update(self):
         if self.is_running and self.time_remaining > 0:
             self.time_remaining -= 1
+            if self.state_log is not None:
+                self.state_log.checkpoint(self)
             return True
         elif self.time_remaining <= 0:
             self._handle_session_end()
@@ -55,6 +70,7 @@ class PomodoroTimer:
         return True
     
     def _handle_session_end(self):
+        self._record('phase_end')
         self.is_running = False
         if self.current_session == "work":
             self.completed_sessions += 1
@@ -69,6 +85,36 @@ class PomodoroTimer:
             self.current_session = "work"
             self.time_remaining = self.work_duration
     
+    def get_state(self):
+        """Return the state needed to restore the timer later"""
+        return {
+            'current_session': self.current_session,
+            'time_remaining': self.time_remaining,
+            'is_running': self.is_running,
+            'session_count': self.session_count,
+            'completed_sessions': self.completed_sessions
+        }
+    
+    def load_state(self, state):
+        """Restore state returned by get_state"""
+        self.current_session = state['current_session']
+        self.time_remaining = state['time_remaining']
+        self.is_running = state['is_running']
+        self.session_count = state['session_count']
+        self.completed_sessions = state['completed_sessions']
+    
+    def apply_event(self, event):
+        """Replay a transition recorded in the state log"""
+        self.time_remaining = event['r']
+        actions = {
+            'start': self.start,
+            'pause': self.pause,
+            'skip': self.skip,
+            'reset': self.reset,
+            'phase_end': self._handle_session_end
+        }
+        actions[event['e']]()
+    
     def get_time_display(self):
         minutes = self.time_remaining // 60
         seconds = self.time_remaining % 60
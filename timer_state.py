@@ -0,0 +1,104 @@
+import json
+import time
+import datetime
+from config import (TIMER_EVENTS_FILE, TIMER_SNAPSHOT_FILE, SNAPSHOT_INTERVAL,
+                    RECOVERY_TIMEOUT)
+from storage import read_json_lines, append_json_line, write_atomic
+
+# Number of logged transitions after which the log is compacted into a snapshot
+EVENTS_PER_SNAPSHOT = 50
+
+class TimerStateLog:
+    """Append-only log of timer transitions with periodic snapshots.
+
+    Every start, pause, skip, reset and phase end is appended to the event
+    log. A snapshot of the full timer state is written every
+    SNAPSHOT_INTERVAL seconds while the timer runs and after
+    EVENTS_PER_SNAPSHOT events, and the log is then truncated, so restoring
+    only ever replays a handful of events.
+    """
+
+    def __init__(self, events_file=TIMER_EVENTS_FILE, snapshot_file=TIMER_SNAPSHOT_FILE):
+        self.events_file = events_file
+        self.snapshot_file = snapshot_file
+        self.sequence = 0
+        self.events_since_snapshot = 0
+        self.last_snapshot = time.time()
+
+    def record(self, action, timer):
+        """Append a transition, together with the time remaining when it happened"""
+        self.sequence += 1
+        event = {'n': self.sequence, 'e': action, 't': round(time.time(), 3),
+                 'r': timer.time_remaining}
+        append_json_line(self.events_file, event, sync=True)
+
+        self.events_since_snapshot += 1
+        if self.events_since_snapshot >= EVENTS_PER_SNAPSHOT:
+            self.snapshot(timer)
+
+    def checkpoint(self, timer):
+        """Snapshot a running timer if the last snapshot is old enough"""
+        if time.time() - self.last_snapshot >= SNAPSHOT_INTERVAL:
+            self.snapshot(timer)
+
+    def snapshot(self, timer):
+        """Write the full timer state and truncate the event log"""
+        snapshot = {'n': self.sequence, 't': round(time.time(), 3), 'state': timer.get_state()}
+        write_atomic(self.snapshot_file, json.dumps(snapshot), sync=True)
+
+        # Events up to self.sequence are covered by the snapshot now
+        open(self.events_file, 'w').close()
+        self.events_since_snapshot = 0
+        self.last_snapshot = time.time()
+
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_file, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def restore(self, timer, session_manager=None):
+        """Restore timer state from the last snapshot plus the events after it.
+
+        The restored timer is always paused. A focus session that was running
+        when the app closed is resumed where it stopped, unless the app was
+        closed for longer than RECOVERY_TIMEOUT; then the focus time spent
+        is logged to session_manager as an interrupted session and the focus
+        phase starts over. Returns True if any saved state was found.
+        """
+        snapshot = self._load_snapshot()
+        events = read_json_lines(self.events_file)
+        if snapshot is None and not events:
+            return False
+
+        # Replay without logging the replayed transitions again
+        timer.state_log = None
+        last_seen = None
+        if snapshot is not None:
+            timer.load_state(snapshot['state'])
+            self.sequence = snapshot['n']
+            last_seen = snapshot['t']
+
+        for event in events:
+            if event['n'] <= self.sequence:
+                continue
+            timer.apply_event(event)
+            self.sequence = event['n']
+            last_seen = event['t']
+
+        was_running = timer.is_running
+        timer.is_running = False
+        timer.state_log = self
+
+        if (was_running and timer.current_session == "work"
+                and time.time() - last_seen > RECOVERY_TIMEOUT):
+            focused = timer.work_duration - timer.time_remaining
+            if session_manager is not None and focused > 0:
+                session_manager.save_session(
+                    "focus", focused // 60, completed=False, notes="Interrupted",
+                    timestamp=datetime.datetime.fromtimestamp(last_seen - focused))
+            timer.time_remaining = timer.work_duration
+
+        self.snapshot(timer)
+        return True
@@ -1,15 +1,17 @@
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import datetime
+import base64
 from config import COLORS
+from chart_cache import ChartCache
+from charts import weekly_chart_data, distribution_chart_data, render_chart
+from session_edit_window import SessionEditWindow
 
 class Dashboard:
-    def __init__(self, parent, session_manager):
+    def __init__(self, parent, session_manager, chart_cache=None):
         self.parent = parent
         self.session_manager = session_manager
+        self.chart_cache = chart_cache if chart_cache is not None else ChartCache()
+        self.chart_images = []
         self.setup_dashboard()
     
     def setup_dashboard(self):
@@ -20,6 +22,9 @@ class Dashboard:
         # Today's Summary
         self.setup_today_summary()
         
+        # Rolling trends
+        self.setup_trends()
+        
         # Progress Visualization
         self.setup_progress_charts()
         
@@ -47,6 +52,33 @@ class Dashboard:
                      foreground=color).pack()
             ttk.Label(metric_frame, text=label, font=('Arial', 9)).pack()
     
+    def setup_trends(self):
+        trends_frame = ttk.LabelFrame(self.dashboard_frame, text="Trends", padding=10)
+        trends_frame.pack(fill='x', pady=(0, 10))
+        
+        trends = self.session_manager.stats.get_metrics()
+        
+        metrics = [
+            ("Avg Daily Focus", f"{trends['ewma_daily_focus']:.0f}m", COLORS['work']),
+            ("Median Session", f"{trends['median_session_length']:.0f}m", COLORS['primary']),
+            ("90% Under", f"{trends['p90_session_length']:.0f}m", COLORS['primary']),
+            ("Skip Rate", f"{trends['skip_rate'] * 100:.0f}%",
+             COLORS['danger'] if trends['skip_trend'] > 0 else COLORS['success']),
+        ]
+        
+        for i, (label, value, color) in enumerate(metrics):
+            metric_frame = ttk.Frame(trends_frame)
+            metric_frame.grid(row=0, column=i, padx=20, sticky='ew')
+            
+            ttk.Label(metric_frame, text=value, font=('Arial', 14, 'bold'), 
+                     foreground=color).pack()
+            ttk.Label(metric_frame, text=label, font=('Arial', 9)).pack()
+        
+        # Anomaly flags
+        for row, anomaly in enumerate(trends['anomalies'], start=1):
+            ttk.Label(trends_frame, text=f"⚠ {anomaly}", font=('Arial', 9),
+                     foreground=COLORS['warning']).grid(row=row, column=0, columnspan=len(metrics), sticky='w')
+    
     def setup_progress_charts(self):
         # Create a frame for charts
         charts_frame = ttk.LabelFrame(self.dashboard_frame, text="Progress Analytics", padding=10)
@@ -60,79 +92,26 @@ class Dashboard:
     
     def create_weekly_chart(self, parent):
         weekly_stats = self.session_manager.get_weekly_stats()
-        
-        fig = Figure(figsize=(6, 3), dpi=80)
-        ax = fig.add_subplot(111)
-        
-        days = list(weekly_stats['daily_focus'].keys())[-7:]  # Last 7 days
-        minutes = [weekly_stats['daily_focus'][day] for day in days]
-        
-        # Use full day names for display
-        day_names = [datetime.datetime.strptime(day, "%Y-%m-%d").strftime("%a") for day in days]
-        
-        bars = ax.bar(day_names, minutes, color=COLORS['work'], alpha=0.7)
-        ax.set_ylabel('Focus Minutes')
-        ax.set_title('Weekly Focus Time')
-        
-        # Add value labels on bars
-        for bar, value in zip(bars, minutes):
-            if value > 0:
-                ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 1, 
-                       str(int(value)), ha='center', va='bottom', fontsize=9)
-        
-        fig.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side='left', padx=(0, 10))
+        data = weekly_chart_data(weekly_stats)
+        self.show_chart(parent, 'weekly', data, padx=(0, 10))
     
     def create_distribution_chart(self, parent):
         sessions = self.session_manager.get_session_history(20)  # Last 20 sessions
+        data = distribution_chart_data(sessions)
         
-        if not sessions:
+        if not data:
             return
         
-        # Count session types
-        session_types = {}
-        for session in sessions:
-            session_type = session['session_type']
-            session_types[session_type] = session_types.get(session_type, 0) + 1
-        
-        if not session_types:
-            return
-            
-        fig = Figure(figsize=(4, 3), dpi=80)
-        ax = fig.add_subplot(111)
-        
-        labels = []
-        sizes = []
-        colors = []
-        
-        type_colors = {
-            'focus': COLORS['work'],
-            'short_break': COLORS['short_break'],
-            'long_break': COLORS['long_break']
-        }
-        
-        type_names = {
-            'focus': 'Focus',
-            'short_break': 'Short Break',
-            'long_break': 'Long Break'
-        }
-        
-        for session_type, count in session_types.items():
-            labels.append(type_names.get(session_type, session_type))
-            sizes.append(count)
-            colors.append(type_colors.get(session_type, COLORS['secondary']))
-        
-        ax.pie(sizes, labels=labels, colors=colors, autopct='%1.0f%%', startangle=90)
-        ax.set_title('Session Distribution')
-        
-        fig.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side='left')
+        self.show_chart(parent, 'distribution', data)
+    
+    def show_chart(self, parent, chart_type, data, padx=0):
+        """Show a chart image, rendering it only if it is not already cached"""
+        image = self.chart_cache.get_or_render(chart_type, data, render_chart)
+        photo = tk.PhotoImage(data=base64.b64encode(image))
+        # Keep a reference so Tk does not discard the image
+        self.chart_images.append(photo)
+        
+        ttk.Label(parent, image=photo).pack(side='left', padx=padx)
     
     def setup_recent_sessions(self):
         sessions_frame = ttk.LabelFrame(self.dashboard_frame, text="Recent Sessions", padding=10)
@@ -141,6 +120,7 @@ class Dashboard:
         # Create treeview for sessions
         columns = ('Time', 'Type', 'Duration', 'Status')
         tree = ttk.Treeview(sessions_frame, columns=columns, show='headings', height=6)
+        self.sessions_tree = tree
         
         # Define headings
         tree.heading('Time', text='Time')
@@ -158,6 +138,11 @@ class Dashboard:
         scrollbar = ttk.Scrollbar(sessions_frame, orient='vertical', command=tree.yview)
         tree.configure(yscrollcommand=scrollbar.set)
         
+        # Edit button, double-clicking a row works as well
+        ttk.Button(sessions_frame, text="Edit", 
+                  command=self.edit_selected_session).pack(side='bottom', anchor='e', pady=(5, 0))
+        tree.bind('<Double-1>', lambda event: self.edit_selected_session())
+        
         # Pack tree and scrollbar
         tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
@@ -167,15 +152,25 @@ class Dashboard:
         for session in reversed(recent_sessions):  # Show newest first
             session_type = 'Focus' if session['session_type'] == 'focus' else 'Break'
             status = '✓' if session['completed'] else '✗'
-            tree.insert('', 'end', values=(
+            tree.insert('', 'end', iid=str(session['id']), values=(
                 session['start_time'],
                 session_type,
                 session['duration'],
                 status
             ))
     
+    def edit_selected_session(self):
+        """Open the edit dialog for the selected session"""
+        selection = self.sessions_tree.selection()
+        if not selection:
+            return
+        session = self.session_manager.get_session(int(selection[0]))
+        if session is not None:
+            SessionEditWindow(self.parent, self.session_manager, session, self.refresh)
+    
     def refresh(self):
         """Refresh all dashboard data"""
         for widget in self.dashboard_frame.winfo_children():
             widget.destroy()
+        self.chart_images = []
         self.setup_dashboard()
\ No newline at end of file